@@ -1,5 +1,5 @@
-import { getDb } from '@/lib/mongodb';
-import { hashPassword, verifyPassword, createToken, getCurrentUser } from '@/lib/auth';
+import { getDb, getPoolMetrics } from '@/lib/mongodb';
+import { hashPassword, verifyPassword, createToken, requireAuth } from '@/lib/auth';
 import { cookies } from 'next/headers';
 import { ObjectId } from 'mongodb';
 
@@ -151,11 +151,7 @@ async function handleLogout(request) {
 }
 
 async function handleMe(request) {
-  const user = await getCurrentUser();
-  if (!user) {
-    return Response.json({ error: 'Not authenticated' }, { status: 401 });
-  }
-  return Response.json({ user });
+  return Response.json({ user: request.user });
 }
 
 // ============================================
@@ -163,14 +159,11 @@ async function handleMe(request) {
 // ============================================
 
 async function handleGetTests(request) {
-  const user = await getCurrentUser();
-  if (!user || (user.role !== 'TEACHER' && user.role !== 'ADMIN')) {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
+  const user = request.user;
   
   const db = await getDb();
   const tests = await db.collection('tests')
-    .find({ teacherId: user._id.toString() })
+    .find({ teacherId: user._id.toString(), deletedAt: null })
     .sort({ createdAt: -1 })
     .toArray();
   
@@ -178,10 +171,7 @@ async function handleGetTests(request) {
 }
 
 async function handleCreateTest(request) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'TEACHER') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
+  const user = request.user;
   
   try {
     const { title, description, variants } = await request.json();
@@ -260,15 +250,12 @@ async function handleCreateTest(request) {
 }
 
 async function handleGetTest(request, testId) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'TEACHER') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
+  const user = request.user;
   
-  const db = await getDb();
+  const db = await getDb({ readOnly: true });
   const test = await db.collection('tests').findOne({ _id: new ObjectId(testId) });
   
-  if (!test) {
+  if (!test || test.deletedAt) {
     return Response.json({ error: 'Test not found' }, { status: 404 });
   }
   
@@ -309,11 +296,87 @@ async function handleGetTest(request, testId) {
   return Response.json({ test });
 }
 
-async function handleDeleteTest(request, testId) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'TEACHER') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
+// Delete a test and everything that references it (variants, questions, options,
+// matching pairs, rooms, room students, answers, results) with a fixed number of
+// $in-based bulk operations. Children go first so an interrupted run can be retried.
+async function cascadeDeleteTest(db, testId) {
+  const ids = (docs) => docs.map(doc => doc._id.toString());
+  
+  const [variantIds, roomIds] = await Promise.all([
+    db.collection('variants').find({ testId }, { projection: { _id: 1 } }).toArray().then(ids),
+    db.collection('rooms').find({ testId }, { projection: { _id: 1 } }).toArray().then(ids)
+  ]);
+  
+  const [questionIds, roomStudentIds] = await Promise.all([
+    db.collection('questions').find({ variantId: { $in: variantIds } }, { projection: { _id: 1 } }).toArray().then(ids),
+    db.collection('roomstudents').find({ roomId: { $in: roomIds } }, { projection: { _id: 1 } }).toArray().then(ids)
+  ]);
+  
+  await Promise.all([
+    db.collection('options').deleteMany({ questionId: { $in: questionIds } }),
+    db.collection('matchingpairs').deleteMany({ questionId: { $in: questionIds } }),
+    db.collection('answers').deleteMany({ roomStudentId: { $in: roomStudentIds } }),
+    db.collection('results').deleteMany({ roomId: { $in: roomIds } })
+  ]);
+  
+  await Promise.all([
+    db.collection('questions').deleteMany({ variantId: { $in: variantIds } }),
+    db.collection('roomstudents').deleteMany({ roomId: { $in: roomIds } })
+  ]);
+  
+  await Promise.all([
+    db.collection('variants').deleteMany({ testId }),
+    db.collection('rooms').deleteMany({ testId })
+  ]);
+  
+  // Second pass for joins and submits that passed their room-status check before
+  // the rooms were closed but wrote after the ids above were collected. A request
+  // stalled for longer than the whole cascade can still leave a row behind.
+  const lateRoomStudentIds = await db.collection('roomstudents')
+    .find({ roomId: { $in: roomIds } }, { projection: { _id: 1 } }).toArray().then(ids);
+  await db.collection('answers').deleteMany({ roomStudentId: { $in: [...roomStudentIds, ...lateRoomStudentIds] } });
+  await db.collection('roomstudents').deleteMany({ roomId: { $in: roomIds } });
+  
+  await db.collection('tests').deleteOne({ _id: new ObjectId(testId) });
+}
+
+// Hide the test and close its open rooms before the cascade starts, so joins and
+// submits that arrive from now on are rejected. Requests already past their
+// room-status check are handled by the cascade's second pass. The tombstone stays
+// until the cascade deletes the test document itself.
+async function tombstoneTest(db, testId) {
+  const now = new Date();
+  await db.collection('tests').updateOne(
+    { _id: new ObjectId(testId) },
+    { $set: { deletedAt: now } }
+  );
+  await db.collection('rooms').updateMany(
+    { testId, status: 'OPEN' },
+    { $set: { status: 'CLOSED', closedAt: now } }
+  );
+}
+
+// Finish cascades cut short by a restart: any tombstoned test still present
+async function resumeTestDeletes() {
+  const db = await getDb();
+  const tests = await db.collection('tests')
+    .find({ deletedAt: { $ne: null } }, { projection: { _id: 1 } })
+    .toArray();
+  
+  for (const test of tests) {
+    await cascadeDeleteTest(db, test._id.toString());
   }
+}
+
+// Once per process, at startup
+if (!global._testDeleteSweep) {
+  global._testDeleteSweep = resumeTestDeletes().catch(error => {
+    console.error('Resume test deletes error:', error);
+  });
+}
+
+async function handleDeleteTest(request, testId) {
+  const user = request.user;
   
   const db = await getDb();
   const test = await db.collection('tests').findOne({ _id: new ObjectId(testId) });
@@ -326,24 +389,22 @@ async function handleDeleteTest(request, testId) {
     return Response.json({ error: 'Forbidden' }, { status: 403 });
   }
   
-  // Delete test and all related data
-  const variants = await db.collection('variants').find({ testId }).toArray();
+  // ?background=1: cascade without holding the request; the tombstone hides the
+  // test at once. Deleting a tombstoned test again retries the cascade, and the
+  // startup sweep resumes any left behind by a restart.
+  const background = new URL(request.url).searchParams.get('background') === '1';
   
-  for (const variant of variants) {
-    const variantId = variant._id.toString();
-    const questions = await db.collection('questions').find({ variantId }).toArray();
-    
-    for (const question of questions) {
-      const questionId = question._id.toString();
-      await db.collection('options').deleteMany({ questionId });
-      await db.collection('matchingpairs').deleteMany({ questionId });
-    }
+  await tombstoneTest(db, testId);
+  
+  if (background) {
+    cascadeDeleteTest(db, testId).catch(error => {
+      console.error('Background delete test error:', error);
+    });
     
-    await db.collection('questions').deleteMany({ variantId });
+    return Response.json({ success: true, deleting: true }, { status: 202 });
   }
   
-  await db.collection('variants').deleteMany({ testId });
-  await db.collection('tests').deleteOne({ _id: new ObjectId(testId) });
+  await cascadeDeleteTest(db, testId);
   
   return Response.json({ success: true });
 }
@@ -353,10 +414,7 @@ async function handleDeleteTest(request, testId) {
 // ============================================
 
 async function handleGetRooms(request) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'TEACHER') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
+  const user = request.user;
   
   const db = await getDb();
   const rooms = await db.collection('rooms')
@@ -378,10 +436,7 @@ async function handleGetRooms(request) {
 }
 
 async function handleCreateRoom(request) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'TEACHER') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
+  const user = request.user;
   
   try {
     const { testId, name } = await request.json();
@@ -394,7 +449,7 @@ async function handleCreateRoom(request) {
     
     // Verify test belongs to teacher
     const test = await db.collection('tests').findOne({ _id: new ObjectId(testId) });
-    if (!test || test.teacherId !== user._id.toString()) {
+    if (!test || test.deletedAt || test.teacherId !== user._id.toString()) {
       return Response.json({ error: 'Test not found or forbidden' }, { status: 403 });
     }
     
@@ -435,10 +490,7 @@ async function handleGetRoom(request, roomId) {
 }
 
 async function handleJoinRoom(request, roomId) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'STUDENT') {
-    return Response.json({ error: 'Only students can join rooms' }, { status: 403 });
-  }
+  const user = request.user;
   
   try {
     const db = await getDb();
@@ -507,10 +559,7 @@ async function handleJoinRoom(request, roomId) {
 }
 
 async function handleGetRoomQuestions(request, roomId) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'STUDENT') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
+  const user = request.user;
   
   try {
     const db = await getDb();
@@ -571,10 +620,7 @@ async function handleGetRoomQuestions(request, roomId) {
 }
 
 async function handleSubmitAnswers(request, roomId) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'STUDENT') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
+  const user = request.user;
   
   try {
     const { answers } = await request.json();
@@ -631,10 +677,7 @@ async function handleSubmitAnswers(request, roomId) {
 }
 
 async function handleCloseRoom(request, roomId) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'TEACHER') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
+  const user = request.user;
   
   try {
     const db = await getDb();
@@ -751,13 +794,10 @@ async function handleCloseRoom(request, roomId) {
 }
 
 async function handleGetRoomResults(request, roomId) {
-  const user = await getCurrentUser();
-  if (!user) {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
+  const user = request.user;
   
   try {
-    const db = await getDb();
+    const db = await getDb({ readOnly: true });
     const room = await db.collection('rooms').findOne({ _id: new ObjectId(roomId) });
     
     if (!room) {
@@ -812,11 +852,6 @@ async function handleGetRoomResults(request, roomId) {
 // ============================================
 
 async function handleGetTeachers(request) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'ADMIN') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
-  
   const db = await getDb();
   const teachers = await db.collection('users')
     .find({ role: 'TEACHER' }, { projection: { password: 0 } })
@@ -826,11 +861,6 @@ async function handleGetTeachers(request) {
 }
 
 async function handleCreateTeacher(request) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'ADMIN') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
-  
   try {
     const { name, email, password } = await request.json();
     
@@ -864,102 +894,117 @@ async function handleCreateTeacher(request) {
 }
 
 async function handleDeleteTeacher(request, teacherId) {
-  const user = await getCurrentUser();
-  if (!user || user.role !== 'ADMIN') {
-    return Response.json({ error: 'Unauthorized' }, { status: 401 });
-  }
-  
   const db = await getDb();
   await db.collection('users').deleteOne({ _id: new ObjectId(teacherId) });
   
   return Response.json({ success: true });
 }
 
+async function handleGetPoolMetrics(request) {
+  return Response.json({ pool: getPoolMetrics() });
+}
+
 // ============================================
 // MAIN ROUTER
 // ============================================
 
-export async function GET(request, { params }) {
-  const path = params?.path || [];
-  const endpoint = '/' + path.join('/');
+// One entry per route. `:id` segments match a 24-hex ObjectId and are passed to
+// the handler in order. `roles` lists who may call the route ([] = any signed-in
+// user, omitted = public); requireAuth enforces it before the handler runs.
+// `denied` overrides the 401 Unauthorized response for rejected callers.
+const ROUTES = [
+  { method: 'POST', path: '/auth/signup', handler: handleSignup },
+  { method: 'POST', path: '/auth/login', handler: handleLogin },
+  { method: 'POST', path: '/auth/logout', handler: handleLogout },
+  { method: 'GET', path: '/auth/me', roles: [], denied: { error: 'Not authenticated', status: 401 }, handler: handleMe },
+  
+  { method: 'GET', path: '/tests', roles: ['TEACHER', 'ADMIN'], handler: handleGetTests },
+  { method: 'POST', path: '/tests', roles: ['TEACHER'], handler: handleCreateTest },
+  { method: 'GET', path: '/tests/:id', roles: ['TEACHER'], handler: handleGetTest },
+  { method: 'DELETE', path: '/tests/:id', roles: ['TEACHER'], handler: handleDeleteTest },
+  
+  { method: 'GET', path: '/rooms', roles: ['TEACHER'], handler: handleGetRooms },
+  { method: 'POST', path: '/rooms', roles: ['TEACHER'], handler: handleCreateRoom },
+  { method: 'GET', path: '/rooms/:id', handler: handleGetRoom },
+  { method: 'POST', path: '/rooms/:id/join', roles: ['STUDENT'], denied: { error: 'Only students can join rooms', status: 403 }, handler: handleJoinRoom },
+  { method: 'GET', path: '/rooms/:id/questions', roles: ['STUDENT'], handler: handleGetRoomQuestions },
+  { method: 'POST', path: '/rooms/:id/submit', roles: ['STUDENT'], handler: handleSubmitAnswers },
+  { method: 'POST', path: '/rooms/:id/close', roles: ['TEACHER'], handler: handleCloseRoom },
+  { method: 'GET', path: '/rooms/:id/results', roles: [], handler: handleGetRoomResults },
+  
+  { method: 'GET', path: '/teachers', roles: ['ADMIN'], handler: handleGetTeachers },
+  { method: 'POST', path: '/teachers', roles: ['ADMIN'], handler: handleCreateTeacher },
+  { method: 'DELETE', path: '/teachers/:id', roles: ['ADMIN'], handler: handleDeleteTeacher },
+  { method: 'GET', path: '/metrics/pool', roles: ['ADMIN'], handler: handleGetPoolMetrics }
+];
+
+// Built once at module load: static paths in a Map, parameterised paths as
+// precompiled regexes per method, every handler already wrapped with its auth check
+const staticRoutes = new Map();
+const dynamicRoutes = { GET: [], POST: [], DELETE: [] };
+
+for (const route of ROUTES) {
+  const handler = route.roles
+    ? requireAuth(route.roles, route.denied)(route.handler)
+    : route.handler;
   
-  try {
-    if (endpoint === '/auth/me') return handleMe(request);
-    if (endpoint === '/tests') return handleGetTests(request);
-    if (endpoint.match(/^\/tests\/[a-f0-9]{24}$/)) {
-      const testId = path[1];
-      return handleGetTest(request, testId);
-    }
-    if (endpoint === '/rooms') return handleGetRooms(request);
-    if (endpoint.match(/^\/rooms\/[a-f0-9]{24}$/)) {
-      const roomId = path[1];
-      return handleGetRoom(request, roomId);
-    }
-    if (endpoint.match(/^\/rooms\/[a-f0-9]{24}\/questions$/)) {
-      const roomId = path[1];
-      return handleGetRoomQuestions(request, roomId);
-    }
-    if (endpoint.match(/^\/rooms\/[a-f0-9]{24}\/results$/)) {
-      const roomId = path[1];
-      return handleGetRoomResults(request, roomId);
-    }
-    if (endpoint === '/teachers') return handleGetTeachers(request);
-    
-    return Response.json({ error: 'Not found' }, { status: 404 });
-  } catch (error) {
-    console.error('GET error:', error);
-    return Response.json({ error: 'Internal server error' }, { status: 500 });
+  if (route.path.includes(':')) {
+    const pattern = new RegExp('^' + route.path.replace(/:\w+/g, '([a-f0-9]{24})') + '$');
+    dynamicRoutes[route.method].push({ pattern, handler });
+  } else {
+    staticRoutes.set(`${route.method} ${route.path}`, handler);
   }
 }
 
-export async function POST(request, { params }) {
-  const path = params?.path || [];
-  const endpoint = '/' + path.join('/');
+function matchRoute(method, endpoint) {
+  const handler = staticRoutes.get(`${method} ${endpoint}`);
+  if (handler) return { handler, args: [] };
   
-  try {
-    if (endpoint === '/auth/signup') return handleSignup(request);
-    if (endpoint === '/auth/login') return handleLogin(request);
-    if (endpoint === '/auth/logout') return handleLogout(request);
-    if (endpoint === '/tests') return handleCreateTest(request);
-    if (endpoint === '/rooms') return handleCreateRoom(request);
-    if (endpoint.match(/^\/rooms\/[a-f0-9]{24}\/join$/)) {
-      const roomId = path[1];
-      return handleJoinRoom(request, roomId);
-    }
-    if (endpoint.match(/^\/rooms\/[a-f0-9]{24}\/submit$/)) {
-      const roomId = path[1];
-      return handleSubmitAnswers(request, roomId);
-    }
-    if (endpoint.match(/^\/rooms\/[a-f0-9]{24}\/close$/)) {
-      const roomId = path[1];
-      return handleCloseRoom(request, roomId);
-    }
-    if (endpoint === '/teachers') return handleCreateTeacher(request);
-    
-    return Response.json({ error: 'Not found' }, { status: 404 });
-  } catch (error) {
-    console.error('POST error:', error);
-    return Response.json({ error: 'Internal server error' }, { status: 500 });
+  for (const route of dynamicRoutes[method]) {
+    const match = route.pattern.exec(endpoint);
+    if (match) return { handler: route.handler, args: match.slice(1) };
   }
+  
+  return null;
 }
 
-export async function DELETE(request, { params }) {
-  const path = params?.path || [];
-  const endpoint = '/' + path.join('/');
+// Set SERVER_TIMING=1 to report routing and auth time in a Server-Timing header
+const SERVER_TIMING = process.env.SERVER_TIMING === '1';
+
+async function dispatch(method, request, params) {
+  const started = performance.now();
+  const endpoint = '/' + (params?.path || []).join('/');
+  const route = matchRoute(method, endpoint);
+  const routeMs = performance.now() - started;
   
+  let response;
   try {
-    if (endpoint.match(/^\/tests\/[a-f0-9]{24}$/)) {
-      const testId = path[1];
-      return handleDeleteTest(request, testId);
-    }
-    if (endpoint.match(/^\/teachers\/[a-f0-9]{24}$/)) {
-      const teacherId = path[1];
-      return handleDeleteTeacher(request, teacherId);
-    }
-    
-    return Response.json({ error: 'Not found' }, { status: 404 });
+    response = route
+      ? await route.handler(request, ...route.args)
+      : Response.json({ error: 'Not found' }, { status: 404 });
   } catch (error) {
-    console.error('DELETE error:', error);
-    return Response.json({ error: 'Internal server error' }, { status: 500 });
+    console.error(`${method} error:`, error);
+    response = Response.json({ error: 'Internal server error' }, { status: 500 });
+  }
+  
+  if (SERVER_TIMING) {
+    const timings = [`route;dur=${routeMs.toFixed(3)}`];
+    if (request.authMs !== undefined) timings.push(`auth;dur=${request.authMs.toFixed(3)}`);
+    timings.push(`total;dur=${(performance.now() - started).toFixed(3)}`);
+    response.headers.set('Server-Timing', timings.join(', '));
   }
+  
+  return response;
+}
+
+export async function GET(request, { params }) {
+  return dispatch('GET', request, params);
+}
+
+export async function POST(request, { params }) {
+  return dispatch('POST', request, params);
+}
+
+export async function DELETE(request, { params }) {
+  return dispatch('DELETE', request, params);
 }
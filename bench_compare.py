@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark Regression Gate for Test Platform
+Compares a benchmark run (bench_results.py format) against a stored baseline.
+For throughput and each endpoint's p99, trials are bootstrap-resampled to get a confidence
+interval on the new/baseline ratio. A metric regresses when the point estimate is past the
+threshold and the interval excludes "no change". The error rate regresses when it rises by
+more than an absolute allowance. Runs with a different name or config (users, concurrency,
+weights, ...) are refused rather than compared. Exits non-zero on any regression.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+
+from bench_results import load_run
+
+DEFAULT_BASELINE = "test_reports/benchmarks/baseline.json"
+
+# Below this many trials per run the interval is meaningless; fall back to the threshold alone
+MIN_TRIALS = 3
+
+
+def bootstrap_ratio(baseline, candidate, confidence=0.95, resamples=10000, seed=0):
+    """Point estimate and CI of mean(candidate) / mean(baseline); all None when the baseline mean is 0"""
+    if statistics.mean(baseline) <= 0:
+        return None, None, None
+    point = statistics.mean(candidate) / statistics.mean(baseline)
+    if len(baseline) < MIN_TRIALS or len(candidate) < MIN_TRIALS:
+        return point, None, None
+
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        base_mean = statistics.mean(rng.choices(baseline, k=len(baseline)))
+        new_mean = statistics.mean(rng.choices(candidate, k=len(candidate)))
+        if base_mean > 0:
+            ratios.append(new_mean / base_mean)
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    low = ratios[int(tail * (len(ratios) - 1))]
+    high = ratios[int((1 - tail) * (len(ratios) - 1))]
+    return point, low, high
+
+
+def compare_metric(name, baseline, candidate, threshold, higher_is_better, confidence, resamples):
+    point, low, high = bootstrap_ratio(baseline, candidate, confidence, resamples)
+    if point is None:
+        past_threshold = significant = False
+    elif higher_is_better:
+        past_threshold = point < 1 - threshold
+        significant = high is None or high < 1
+    else:
+        past_threshold = point > 1 + threshold
+        significant = low is None or low > 1
+    return {
+        'metric': name,
+        'baseline': statistics.mean(baseline),
+        'candidate': statistics.mean(candidate),
+        'ratio': point,
+        'ci': (low, high) if low is not None else None,
+        'regressed': past_threshold and significant,
+    }
+
+
+def error_rate(trial):
+    return trial['errors'] / trial['requests'] if trial['requests'] else 1.0
+
+
+def compare_error_rate(baseline_run, candidate_run, threshold):
+    """
+    Regressed when the mean error rate rises by more than `threshold` (absolute).
+    A trial with no requests at all counts as 100% errors.
+    """
+    baseline = statistics.mean(error_rate(trial) for trial in baseline_run['trials'])
+    candidate = statistics.mean(error_rate(trial) for trial in candidate_run['trials'])
+    return {
+        'metric': "error rate (%)",
+        'baseline': baseline * 100,
+        'candidate': candidate * 100,
+        'ratio': candidate / baseline if baseline > 0 else None,
+        'ci': None,
+        'regressed': candidate - baseline > threshold,
+    }
+
+
+def compare_runs(baseline_run, candidate_run, p99_threshold=0.10, throughput_threshold=0.10,
+                 error_rate_threshold=0.001, confidence=0.95, resamples=10000):
+    comparisons = [compare_error_rate(baseline_run, candidate_run, error_rate_threshold), compare_metric(
+        "throughput (req/s)",
+        [trial['throughput'] for trial in baseline_run['trials']],
+        [trial['throughput'] for trial in candidate_run['trials']],
+        throughput_threshold, True, confidence, resamples)]
+
+    labels = sorted(set(baseline_run['summary']['endpoints']) & set(candidate_run['summary']['endpoints']))
+    for label in labels:
+        baseline = [t['endpoints'][label]['p99_ms'] for t in baseline_run['trials'] if label in t['endpoints']]
+        candidate = [t['endpoints'][label]['p99_ms'] for t in candidate_run['trials'] if label in t['endpoints']]
+        if baseline and candidate and statistics.mean(baseline) > 0:
+            comparisons.append(compare_metric(f"{label} p99 (ms)", baseline, candidate,
+                                              p99_threshold, False, confidence, resamples))
+
+    return comparisons
+
+
+def config_differences(baseline_run, candidate_run):
+    """Workload settings that make the two runs incomparable"""
+    differences = []
+    if baseline_run['name'] != candidate_run['name']:
+        differences.append(f"name: {baseline_run['name']} → {candidate_run['name']}")
+    base_config = baseline_run.get('config', {})
+    new_config = candidate_run.get('config', {})
+    for key in sorted(set(base_config) | set(new_config)):
+        if base_config.get(key) != new_config.get(key):
+            differences.append(f"{key}: {base_config.get(key)} → {new_config.get(key)}")
+    return differences
+
+
+def environment_differences(baseline_run, candidate_run):
+    keys = ('hostname', 'platform', 'cpu_count', 'base_url')
+    base_env = baseline_run.get('environment', {})
+    new_env = candidate_run.get('environment', {})
+    return [f"{key}: {base_env.get(key)} → {new_env.get(key)}" for key in keys if base_env.get(key) != new_env.get(key)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when a benchmark run regresses against the baseline")
+    parser.add_argument('run', help="Benchmark result JSON to check")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--p99-threshold', type=float, default=0.10, help="Allowed relative p99 increase")
+    parser.add_argument('--throughput-threshold', type=float, default=0.10,
+                        help="Allowed relative throughput decrease")
+    parser.add_argument('--error-rate-threshold', type=float, default=0.001,
+                        help="Allowed absolute error-rate increase (0.001 = 0.1 percentage points)")
+    parser.add_argument('--allow-config-change', action='store_true',
+                        help="Compare even when the benchmark name or config differs from the baseline")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--resamples', type=int, default=10000)
+    parser.add_argument('--save-baseline', action='store_true', help="Store the run as the new baseline and exit")
+    args = parser.parse_args()
+
+    candidate_run = load_run(args.run)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        shutil.copyfile(args.run, args.baseline)
+        print(f"📌 Saved {args.run} as baseline {args.baseline}")
+        return True
+
+    baseline_run = load_run(args.baseline)
+
+    print("⚖️  Benchmark Comparison")
+    print("=" * 60)
+    print(f"Baseline:  {baseline_run['name']} ({baseline_run['environment'].get('git_commit')}, "
+          f"{len(baseline_run['trials'])} trials)")
+    print(f"Candidate: {candidate_run['name']} ({candidate_run['environment'].get('git_commit')}, "
+          f"{len(candidate_run['trials'])} trials)")
+
+    config_changes = config_differences(baseline_run, candidate_run)
+    if config_changes:
+        print(f"{'⚠️ ' if args.allow_config_change else '❌'} Benchmark config differs from baseline:")
+        for difference in config_changes:
+            print(f"   - {difference}")
+        if not args.allow_config_change:
+            print("Refusing to compare; rerun with the baseline's settings, save a new baseline "
+                  "or pass --allow-config-change")
+            return False
+
+    differences = environment_differences(baseline_run, candidate_run)
+    if differences:
+        print("⚠️  Environment differs from baseline:")
+        for difference in differences:
+            print(f"   - {difference}")
+    if min(len(baseline_run['trials']), len(candidate_run['trials'])) < MIN_TRIALS:
+        print(f"⚠️  Fewer than {MIN_TRIALS} trials; significance not assessed, thresholds only")
+
+    comparisons = compare_runs(baseline_run, candidate_run, args.p99_threshold, args.throughput_threshold,
+                               args.error_rate_threshold, args.confidence, args.resamples)
+
+    print(f"\n{'Metric':<55} {'baseline':>10} {'new':>10} {'change':>8}  {'CI':<17}")
+    for comparison in comparisons:
+        status = "❌" if comparison['regressed'] else "✅"
+        ci = comparison['ci']
+        ci_text = f"[{(ci[0] - 1) * 100:+.0f}%, {(ci[1] - 1) * 100:+.0f}%]" if ci else "-"
+        change = f"{(comparison['ratio'] - 1) * 100:+.1f}%" if comparison['ratio'] is not None else "-"
+        print(f"{status} {comparison['metric']:<53} {comparison['baseline']:>10.1f} {comparison['candidate']:>10.1f} "
+              f"{change:>8}  {ci_text:<17}")
+
+    regressions = [c['metric'] for c in comparisons if c['regressed']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed past threshold:")
+        for metric in regressions:
+            print(f"   - {metric}")
+    else:
+        print("\n🎉 No significant regressions.")
+
+    return not regressions
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark Result Format for Test Platform
+One JSON document per run: configuration, environment fingerprint and one entry per trial
+with throughput and per-endpoint latency percentiles. Written by load_runner.py --output
+and compared against a stored baseline by bench_compare.py.
+"""
+
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+FORMAT_VERSION = "test-platform-bench/1"
+
+
+def git_revision():
+    """Current commit and whether the tree has local changes, or (None, None) outside git"""
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=cwd, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(status)
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def environment_fingerprint(base_url):
+    commit, dirty = git_revision()
+    return {
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'python': sys.version.split()[0],
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+        'git_dirty': dirty,
+        'base_url': base_url,
+    }
+
+
+def trial_result(recorder, elapsed):
+    """Summarise one trial's Recorder (see load_runner.py) over `elapsed` seconds as a trial entry"""
+    totals = recorder.totals(elapsed)
+    return {
+        'duration_s': elapsed,
+        'requests': totals['requests'],
+        'errors': totals['errors'],
+        'throughput': totals['throughput'],
+        'endpoints': recorder.summary(),
+    }
+
+
+def build_run(name, trials, config, base_url):
+    return {
+        'format': FORMAT_VERSION,
+        'name': name,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_fingerprint(base_url),
+        'config': config,
+        'trials': trials,
+        'summary': summarize(trials),
+    }
+
+
+def summarize(trials):
+    """Medians across trials, for a quick read of the file"""
+    endpoints = sorted({label for trial in trials for label in trial['endpoints']})
+    return {
+        'throughput': statistics.median(trial['throughput'] for trial in trials),
+        'endpoints': {
+            label: {
+                metric: statistics.median(trial['endpoints'][label][metric]
+                                          for trial in trials if label in trial['endpoints'])
+                for metric in ('p50_ms', 'p95_ms', 'p99_ms')
+            }
+            for label in endpoints
+        },
+    }
+
+
+def save_run(run, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(run, f, indent=2)
+
+
+def load_run(path):
+    with open(path) as f:
+        run = json.load(f)
+    if run.get('format') != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark format {run.get('format')!r}")
+    return run
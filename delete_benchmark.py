@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Cascade Delete Benchmark for Test Platform
+Builds a large graded exam (5 variants x 100 questions, 500 students who joined,
+submitted and were graded on close), then times DELETE /tests/:id and checks that
+the test and its dependent data are gone.
+In background mode the API hides the test as soon as it is tombstoned, so completion
+is read from MongoDB directly (requires pymongo and --mongo-url).
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_results import build_run, save_run, trial_result
+from load_runner import Recorder
+from scenarios import (ApiClient, JOIN_SUBMIT, LOCAL_BASE_URL, Scenario, Step, generate_account, login,
+                       save_json, signup)
+
+try:
+    from bson import ObjectId
+    from pymongo import MongoClient
+except ImportError:
+    MongoClient = None
+
+
+def large_test(variants=5, questions=100):
+    """Test payload cycling MULTIPLE_CHOICE, MATCHING and OPEN questions"""
+    def question(v, q):
+        kind = ('MULTIPLE_CHOICE', 'MATCHING', 'OPEN')[q % 3]
+        payload = {"text": f"Variant {v} question {q}", "type": kind, "points": 1 + q % 3}
+        if kind == 'MULTIPLE_CHOICE':
+            payload["options"] = [{"text": f"Option {o}", "isCorrect": o == 0} for o in range(4)]
+        elif kind == 'MATCHING':
+            payload["pairs"] = [{"left": f"L{p}", "right": f"R{p}"} for p in range(3)]
+        return payload
+
+    return {
+        "title": f"Delete Benchmark {variants}x{questions}",
+        "description": "Large test for cascade delete timing",
+        "variants": [
+            {"name": f"Variant {v + 1}", "questions": [question(v, q) for q in range(questions)]}
+            for v in range(variants)
+        ]
+    }
+
+
+def build_exam(base_url, variants, questions, students, concurrency):
+    """Create the test and room, run every student through it and grade on close"""
+    shared = {'teacher': generate_account('teacher'), 'payload': large_test(variants, questions)}
+    setup = Scenario("Delete Benchmark Setup", [
+        signup('teacher'),
+        Step("Teacher Create Test", 'POST', '/tests', body=lambda ctx: ctx['payload'],
+             save=save_json('test_id', 'testId')),
+        Step("Teacher Create Room", 'POST', '/rooms',
+             body=lambda ctx: {"testId": ctx['test_id'], "name": "Delete Benchmark Room"},
+             save=save_json('room_id', 'roomId')),
+    ])
+
+    start = time.perf_counter()
+    if not setup.run(ApiClient(base_url), shared):
+        raise RuntimeError("Could not create the benchmark test")
+    print(f"📝 Created {variants}x{questions}-question test in {time.perf_counter() - start:.1f}s")
+
+    def student(index):
+        ctx = {**shared, 'student': generate_account('student')}
+        client = ApiClient(base_url, verbose=False)
+        return signup('student').run(client, ctx)[0] and JOIN_SUBMIT.run(client, ctx)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        submitted = sum(pool.map(student, range(students)))
+    print(f"🎓 {submitted}/{students} students submitted in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    close = Scenario("Close Room", [login('teacher'), Step("Teacher Close Room", 'POST', '/rooms/{room_id}/close')])
+    if not close.run(ApiClient(base_url), shared):
+        raise RuntimeError("Could not close the benchmark room")
+    print(f"🔒 Graded and closed room in {time.perf_counter() - start:.1f}s")
+
+    return shared
+
+
+def leftovers(db, shared):
+    """Documents still referencing the test or its room, by collection"""
+    counts = {
+        'tests': db.tests.count_documents({'_id': ObjectId(shared['test_id'])}),
+        'variants': db.variants.count_documents({'testId': shared['test_id']}),
+        'rooms': db.rooms.count_documents({'testId': shared['test_id']}),
+        'roomstudents': db.roomstudents.count_documents({'roomId': shared['room_id']}),
+        'results': db.results.count_documents({'roomId': shared['room_id']}),
+    }
+    return {name: count for name, count in counts.items() if count}
+
+
+def time_delete(base_url, shared, background, db=None, poll_timeout=300):
+    """Time the DELETE request and, in background mode, until the test document is gone"""
+    recorder = Recorder()
+    client = ApiClient(base_url)
+    login('teacher').run(client, shared)
+    client.recorder = recorder
+
+    path = '/tests/{test_id}?background=1' if background else '/tests/{test_id}'
+    delete = Step("Delete Test", 'DELETE', path, expect=202 if background else 200)
+
+    start = time.perf_counter()
+    success, details = delete.run(client, shared)
+    request_s = time.perf_counter() - start
+    if not success:
+        raise RuntimeError(f"Delete failed: {details}")
+    client.recorder = None  # Only the DELETE is measured
+
+    if db is None:
+        # Synchronous delete: the response is sent after the cascade, so the API view is final
+        _, room_gone = client.make_request('GET', f"/rooms/{shared['room_id']}", expected_status=404)
+        _, test_gone = client.make_request('GET', f"/tests/{shared['test_id']}", expected_status=404)
+        return recorder, request_s, request_s, room_gone and test_gone
+
+    # The test document is the cascade's last delete
+    test_filter = {'_id': ObjectId(shared['test_id'])}
+    while db.tests.count_documents(test_filter) and time.perf_counter() - start < poll_timeout:
+        time.sleep(0.2)
+    complete_s = time.perf_counter() - start
+
+    remaining = leftovers(db, shared)
+    if remaining:
+        print(f"⚠️  Left behind: {remaining}")
+    return recorder, request_s, complete_s, not remaining
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time cascade deletion of a large graded test")
+    parser.add_argument('--base-url', default=LOCAL_BASE_URL)
+    parser.add_argument('--variants', type=int, default=5)
+    parser.add_argument('--questions', type=int, default=100, help="Questions per variant")
+    parser.add_argument('--students', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--background', action='store_true', help="Use DELETE ?background=1 (tombstone + job)")
+    parser.add_argument('--mongo-url', default=os.environ.get('MONGO_URL'),
+                        help="MongoDB URI to poll for completion and leftovers (requires pymongo)")
+    parser.add_argument('--output', help="Write a benchmark result JSON (see bench_results.py)")
+    args = parser.parse_args()
+
+    db = None
+    if args.mongo_url and MongoClient is not None:
+        db = MongoClient(args.mongo_url, serverSelectionTimeoutMS=5000).testplatform
+    elif args.background:
+        print("❌ --background needs pymongo and --mongo-url: the API hides a tombstoned test "
+              "before its cascade finishes")
+        return False
+
+    print("🗑️  Cascade Delete Benchmark")
+    print("=" * 60)
+    shared = build_exam(args.base_url, args.variants, args.questions, args.students, args.concurrency)
+    recorder, request_s, complete_s, cleaned = time_delete(args.base_url, shared, args.background, db)
+
+    print(f"\nDELETE response: {request_s * 1000:.0f}ms")
+    print(f"Cascade complete: {complete_s * 1000:.0f}ms")
+    print(f"{'✅' if cleaned else '❌'} Test and room {'removed' if cleaned else 'still reachable'}")
+
+    if args.output:
+        trial = trial_result(recorder, complete_s)
+        config = {'variants': args.variants, 'questions': args.questions,
+                  'students': args.students, 'background': args.background, 'mongo_poll': db is not None}
+        save_run(build_run("cascade-delete", [trial], config, args.base_url), args.output)
+        print(f"Benchmark result written to {args.output}")
+
+    return cleaned
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
@@ -54,17 +54,18 @@ export async function getCurrentUser() {
   }
 }
 
-export function requireAuth(allowedRoles = []) {
-  return async function(handler) {
+// Wraps a route handler so it only runs for a signed-in user with one of
+// allowedRoles (any role when empty). Anyone else gets the `denied` response.
+// The user is passed on as request.user and the lookup time as request.authMs.
+export function requireAuth(allowedRoles = [], denied = { error: 'Unauthorized', status: 401 }) {
+  return function(handler) {
     return async function(request, ...args) {
+      const started = performance.now();
       const user = await getCurrentUser();
+      request.authMs = performance.now() - started;
       
-      if (!user) {
-        return Response.json({ error: 'Unauthorized' }, { status: 401 });
-      }
-      
-      if (allowedRoles.length > 0 && !allowedRoles.includes(user.role)) {
-        return Response.json({ error: 'Forbidden' }, { status: 403 });
+      if (!user || (allowedRoles.length > 0 && !allowedRoles.includes(user.role))) {
+        return Response.json({ error: denied.error }, { status: denied.status });
       }
       
       request.user = user;
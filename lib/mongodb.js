@@ -5,25 +5,129 @@ if (!process.env.MONGO_URL) {
 }
 
 const uri = process.env.MONGO_URL;
-const options = {};
 
-let client;
-let clientPromise;
+function intFromEnv(name, fallback) {
+  const value = parseInt(process.env[name], 10);
+  return Number.isNaN(value) ? fallback : value;
+}
+
+// Pool and timeout settings; defaults match the driver's own
+const options = {
+  maxPoolSize: intFromEnv('MONGO_MAX_POOL_SIZE', 100),
+  minPoolSize: intFromEnv('MONGO_MIN_POOL_SIZE', 0),
+  waitQueueTimeoutMS: intFromEnv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 0),
+  maxIdleTimeMS: intFromEnv('MONGO_MAX_IDLE_TIME_MS', 0),
+  connectTimeoutMS: intFromEnv('MONGO_CONNECT_TIMEOUT_MS', 30000),
+  socketTimeoutMS: intFromEnv('MONGO_SOCKET_TIMEOUT_MS', 0),
+  serverSelectionTimeoutMS: intFromEnv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 30000)
+};
+
+// Read preference for read-only routes (results, test detail)
+const readOnlyPreference = process.env.MONGO_READ_ONLY_PREFERENCE || 'secondaryPreferred';
+
+// Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is open-ended
+const WAIT_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000];
+
+// Pool checkout metrics, kept on global so every module load shares one set.
+// Everything is cumulative since process start: callers take two readings and
+// subtract to get the waits of one phase of a run.
+if (!global._mongoPoolMetrics) {
+  global._mongoPoolMetrics = {
+    connectionsCreated: 0,
+    connectionsClosed: 0,
+    checkedOut: 0,
+    checkedIn: 0,
+    checkoutFailures: 0,
+    checkoutTimeouts: 0,
+    waitCount: 0,
+    waitTotalMs: 0,
+    waitMaxMs: 0,
+    waitBuckets: new Array(WAIT_BUCKETS_MS.length + 1).fill(0)
+  };
+}
+const poolMetrics = global._mongoPoolMetrics;
+
+function recordWait(durationMS) {
+  if (typeof durationMS !== 'number') return;
+  poolMetrics.waitCount++;
+  poolMetrics.waitTotalMs += durationMS;
+  poolMetrics.waitMaxMs = Math.max(poolMetrics.waitMaxMs, durationMS);
+  const bucket = WAIT_BUCKETS_MS.findIndex((bound) => durationMS <= bound);
+  poolMetrics.waitBuckets[bucket === -1 ? WAIT_BUCKETS_MS.length : bucket]++;
+}
 
-if (process.env.NODE_ENV === 'development') {
-  if (!global._mongoClientPromise) {
-    client = new MongoClient(uri, options);
-    global._mongoClientPromise = client.connect();
+function attachPoolMetrics(client) {
+  client.on('connectionCreated', () => { poolMetrics.connectionsCreated++; });
+  client.on('connectionClosed', () => { poolMetrics.connectionsClosed++; });
+  client.on('connectionCheckedIn', () => { poolMetrics.checkedIn++; });
+  client.on('connectionCheckedOut', (event) => {
+    poolMetrics.checkedOut++;
+    recordWait(event.durationMS);
+  });
+  client.on('connectionCheckOutFailed', (event) => {
+    poolMetrics.checkoutFailures++;
+    if (event.reason === 'timeout') poolMetrics.checkoutTimeouts++;
+    recordWait(event.durationMS);
+  });
+}
+
+// Upper bound of the bucket holding the pct-th wait; null if it is in the open-ended bucket
+function histogramPercentile(pct) {
+  if (poolMetrics.waitCount === 0) return null;
+  const rank = Math.max(1, Math.ceil((pct / 100) * poolMetrics.waitCount));
+  let seen = 0;
+  for (let i = 0; i < WAIT_BUCKETS_MS.length; i++) {
+    seen += poolMetrics.waitBuckets[i];
+    if (seen >= rank) return WAIT_BUCKETS_MS[i];
   }
-  clientPromise = global._mongoClientPromise;
-} else {
-  client = new MongoClient(uri, options);
-  clientPromise = client.connect();
+  return null;
+}
+
+export function getPoolMetrics() {
+  return {
+    config: { ...options, readOnlyPreference },
+    connections: {
+      created: poolMetrics.connectionsCreated,
+      closed: poolMetrics.connectionsClosed,
+      open: poolMetrics.connectionsCreated - poolMetrics.connectionsClosed,
+      inUse: poolMetrics.checkedOut - poolMetrics.checkedIn
+    },
+    checkouts: {
+      total: poolMetrics.checkedOut,
+      failed: poolMetrics.checkoutFailures,
+      timedOut: poolMetrics.checkoutTimeouts
+    },
+    // Since process start; percentiles are bucket upper bounds. `buckets` holds the
+    // raw per-bucket counts (one more than `bounds`, for waits above the last bound)
+    waitMs: {
+      count: poolMetrics.waitCount,
+      total: poolMetrics.waitTotalMs,
+      mean: poolMetrics.waitCount > 0 ? poolMetrics.waitTotalMs / poolMetrics.waitCount : null,
+      p50: histogramPercentile(50),
+      p95: histogramPercentile(95),
+      p99: histogramPercentile(99),
+      max: poolMetrics.waitCount > 0 ? poolMetrics.waitMaxMs : null,
+      bounds: WAIT_BUCKETS_MS,
+      buckets: [...poolMetrics.waitBuckets]
+    }
+  };
 }
 
+// Reuse one client per process in every environment; a fresh client per module
+// load would open a separate pool each time
+if (!global._mongoClientPromise) {
+  const client = new MongoClient(uri, options);
+  attachPoolMetrics(client);
+  global._mongoClientPromise = client.connect();
+}
+const clientPromise = global._mongoClientPromise;
+
 export default clientPromise;
 
-export async function getDb() {
+export async function getDb({ readOnly = false } = {}) {
   const client = await clientPromise;
+  if (readOnly) {
+    return client.db('testplatform', { readPreference: readOnlyPreference });
+  }
   return client.db('testplatform');
 }
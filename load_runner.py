@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Load Engine for Test Platform Scenarios
+Runs a weighted mix of scenarios (see scenarios.py) as virtual users, each with its
+own session, and reports per-step latency percentiles and throughput.
+"""
+
+import argparse
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_results import build_run, save_run, trial_result
+from scenarios import ApiClient, BASE_URL, EXAM_SETUP, EXAM_TEARDOWN, LOAD_MIX, REQUEST_TIMEOUT
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an unsorted list of numbers"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def format_value(value, unit='', digits=1):
+    """Table cell for an optional number; "-" when missing, strings (e.g. "overflow") as-is"""
+    if value is None:
+        return "-"
+    if isinstance(value, str):
+        return value
+    return f"{value:.{digits}f}{unit}"
+
+
+class Recorder:
+    """Thread-safe request latencies (seconds) grouped by step label"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, label, elapsed, success):
+        with self.lock:
+            self.samples.setdefault(label, []).append(elapsed)
+            if not success:
+                self.errors[label] = self.errors.get(label, 0) + 1
+
+    def summary(self):
+        """Per-label count, error count and latency percentiles in milliseconds"""
+        with self.lock:
+            samples = {label: list(values) for label, values in self.samples.items()}
+            errors = dict(self.errors)
+
+        summary = {}
+        for label, values in samples.items():
+            summary[label] = {
+                'count': len(values),
+                'errors': errors.get(label, 0),
+                'mean_ms': sum(values) / len(values) * 1000,
+                'p50_ms': percentile(values, 50) * 1000,
+                'p95_ms': percentile(values, 95) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+            }
+        return summary
+
+    def latencies(self):
+        """Every recorded latency across all labels"""
+        with self.lock:
+            return [value for values in self.samples.values() for value in values]
+
+    def total_errors(self):
+        with self.lock:
+            return sum(self.errors.values())
+
+    def total_requests(self):
+        with self.lock:
+            return sum(len(values) for values in self.samples.values())
+
+    def totals(self, elapsed):
+        """Request and error counts, throughput over `elapsed` seconds and latency percentiles (ms) across all labels"""
+        latencies = self.latencies()
+        return {
+            'requests': len(latencies),
+            'errors': self.total_errors(),
+            'throughput': len(latencies) / elapsed if elapsed else 0,
+            'p50_ms': percentile(latencies, 50) * 1000 if latencies else None,
+            'p95_ms': percentile(latencies, 95) * 1000 if latencies else None,
+            'p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+        }
+
+
+class LoadRunner:
+    """
+    Runs `users` virtual users, `concurrency` at a time, each picking one scenario by weight.
+    `shared` seeds the setup context; `user_data(index)` adds per-user values (e.g. an existing account).
+    Requests taking longer than `request_timeout` seconds fail.
+    """
+
+    def __init__(self, scenarios=LOAD_MIX, users=100, concurrency=20, base_url=BASE_URL,
+                 setup=EXAM_SETUP, teardown=EXAM_TEARDOWN, recorder=None, shared=None, user_data=None,
+                 request_timeout=REQUEST_TIMEOUT):
+        self.scenarios = scenarios
+        self.users = users
+        self.concurrency = concurrency
+        self.base_url = base_url
+        self.setup = setup
+        self.teardown = teardown
+        self.recorder = recorder or Recorder()
+        self.outcomes = {scenario.name: {'passed': 0, 'failed': 0} for scenario in scenarios}
+        self.lock = threading.Lock()
+        self.shared = dict(shared or {})
+        self.user_data = user_data
+        self.request_timeout = request_timeout
+        self.teardown_passed = None
+        self.elapsed = 0
+
+    def client(self, **kwargs):
+        return ApiClient(self.base_url, timeout=self.request_timeout, **kwargs)
+
+    def run_setup(self):
+        """Run the setup scenario once; its context is copied into every virtual user"""
+        if self.setup and not self.setup.run(self.client(), self.shared):
+            raise RuntimeError(f"Setup scenario '{self.setup.name}' failed")
+
+    def run_teardown(self):
+        """Run the teardown scenario; its outcome is kept in `teardown_passed`"""
+        if self.teardown:
+            self.teardown_passed = self.teardown.run(self.client(), dict(self.shared))
+
+    def run_user(self, index):
+        scenario = random.choices(self.scenarios, weights=[s.weight for s in self.scenarios])[0]
+        client = self.client(recorder=self.recorder, verbose=False)
+        ctx = dict(self.shared)
+        if self.user_data:
+            ctx.update(self.user_data(index))
+        passed = scenario.run(client, ctx)
+        with self.lock:
+            self.outcomes[scenario.name]['passed' if passed else 'failed'] += 1
+        return passed
+
+    def run_users(self, count):
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            return list(pool.map(self.run_user, range(count)))
+
+    def run(self):
+        self.run_setup()
+        start = time.perf_counter()
+        try:
+            self.run_users(self.users)
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.run_teardown()
+        return self.recorder
+
+    def throughput(self):
+        return self.recorder.total_requests() / self.elapsed if self.elapsed else 0
+
+    def print_report(self):
+        print("\n" + "=" * 60)
+        print("📈 LOAD SUMMARY")
+        print("=" * 60)
+        print(f"Virtual users: {self.users} (concurrency {self.concurrency})")
+        print(f"Duration: {self.elapsed:.1f}s, Throughput: {self.throughput():.1f} req/s\n")
+
+        for name, outcome in self.outcomes.items():
+            print(f"{name}: {outcome['passed']} passed, {outcome['failed']} failed")
+
+        print(f"\n{'Step':<45} {'count':>7} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for label, stats in sorted(self.recorder.summary().items()):
+            print(f"{label:<45} {stats['count']:>7} {stats['errors']:>5} "
+                  f"{stats['p50_ms']:>7.0f}ms {stats['p95_ms']:>7.0f}ms {stats['p99_ms']:>7.0f}ms")
+
+
+def parse_weights(values):
+    """Parse repeated NAME=WEIGHT overrides"""
+    weights = {}
+    for value in values or []:
+        name, _, weight = value.rpartition('=')
+        weights[name] = float(weight)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Test Platform scenario mix under load")
+    parser.add_argument('--users', type=int, default=100, help="Total virtual users to run")
+    parser.add_argument('--concurrency', type=int, default=20, help="Virtual users running at once")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--weight', action='append', metavar='SCENARIO=N',
+                        help="Override a scenario weight, e.g. --weight 'Teacher Monitor=2'")
+    parser.add_argument('--trials', type=int, default=1,
+                        help="Repeat the run; bench_compare.py needs several trials for significance")
+    parser.add_argument('--name', default="load", help="Run name stored in the benchmark result")
+    parser.add_argument('--output', help="Write a benchmark result JSON (see bench_results.py)")
+    args = parser.parse_args()
+
+    weights = parse_weights(args.weight)
+    for scenario in LOAD_MIX:
+        scenario.weight = weights.get(scenario.name, scenario.weight)
+
+    trials = []
+    failed = 0
+    for trial in range(args.trials):
+        if args.trials > 1:
+            print(f"\n🔁 Trial {trial + 1}/{args.trials}")
+        runner = LoadRunner(users=args.users, concurrency=args.concurrency, base_url=args.base_url)
+        runner.run()
+        runner.print_report()
+        trials.append(trial_result(runner.recorder, runner.elapsed))
+        failed += sum(outcome['failed'] for outcome in runner.outcomes.values())
+
+    if args.output:
+        config = {
+            'users': args.users,
+            'concurrency': args.concurrency,
+            'weights': {scenario.name: scenario.weight for scenario in LOAD_MIX},
+        }
+        save_run(build_run(args.name, trials, config, args.base_url), args.output)
+        print(f"\nBenchmark result written to {args.output}")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
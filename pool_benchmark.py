@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+MongoDB Pool Size Sweep for Test Platform
+For each pool size, restarts the server with MONGO_MAX_POOL_SIZE set, drives a concurrent
+join/submit workload and reads pool checkout waits from /api/metrics/pool just before
+and just after the timed phase; the difference of the cumulative counters and wait
+histogram covers only the timed requests.
+The knee is the smallest pool size whose throughput is within tolerance of the best.
+"""
+
+import argparse
+import json
+import math
+import os
+import shlex
+import signal
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from load_runner import Recorder, format_value
+from scenarios import (ApiClient, EXAM_SETUP, EXAM_TEARDOWN, JOIN_SUBMIT, LOCAL_BASE_URL, Step, generate_account,
+                       save_json, signup)
+
+GET_POOL_METRICS = Step("Get Pool Metrics", 'GET', '/metrics/pool', save=save_json('pool', 'pool'))
+
+
+class ServerProcess:
+    """Next.js server started with extra environment, stopped as a whole process group"""
+
+    def __init__(self, command, cwd, env, base_url, startup_timeout=120):
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.base_url = base_url
+        self.startup_timeout = startup_timeout
+        self.process = None
+
+    def responding(self):
+        try:
+            requests.get(f"{self.base_url}/auth/me", timeout=2)
+            return True
+        except requests.RequestException:
+            return False
+
+    def __enter__(self):
+        if self.responding():
+            raise RuntimeError(f"Something is already serving {self.base_url}; stop it before the sweep")
+        self.process = subprocess.Popen(shlex.split(self.command), cwd=self.cwd,
+                                        env={**os.environ, **self.env},
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                        start_new_session=True)
+        deadline = time.time() + self.startup_timeout
+        while time.time() < deadline:
+            self.check_running()
+            if self.responding():
+                return self
+            time.sleep(1)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"Server not ready after {self.startup_timeout}s")
+
+    def check_running(self):
+        if self.process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {self.process.returncode}")
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+
+
+def bucket_percentile(bounds, counts, pct):
+    """Upper bound of the histogram bucket holding the pct-th sample; "overflow" for the open-ended bucket"""
+    total = sum(counts)
+    if total == 0:
+        return None
+    rank = max(1, math.ceil(pct / 100 * total))
+    seen = 0
+    for bound, count in zip(bounds, counts):
+        seen += count
+        if seen >= rank:
+            return bound
+    return "overflow"
+
+
+def pool_delta(before, after):
+    """Pool activity between two /metrics/pool readings"""
+    wait_before, wait_after = before['waitMs'], after['waitMs']
+    buckets = [new - old for old, new in zip(wait_before['buckets'], wait_after['buckets'])]
+    count = wait_after['count'] - wait_before['count']
+    return {
+        'checkout_wait_ms': {
+            'count': count,
+            'mean': (wait_after['total'] - wait_before['total']) / count if count else None,
+            'p50': bucket_percentile(wait_after['bounds'], buckets, 50),
+            'p95': bucket_percentile(wait_after['bounds'], buckets, 95),
+            'p99': bucket_percentile(wait_after['bounds'], buckets, 99),
+            'buckets': buckets,
+        },
+        'checkouts': {key: after['checkouts'][key] - before['checkouts'][key] for key in after['checkouts']},
+        'connections': {
+            'created': after['connections']['created'] - before['connections']['created'],
+            'closed': after['connections']['closed'] - before['connections']['closed'],
+            'open': after['connections']['open'],
+        },
+    }
+
+
+def read_pool(admin, metrics):
+    if not GET_POOL_METRICS.run(admin, metrics)[0]:
+        raise RuntimeError("Could not read /metrics/pool")
+    return metrics['pool']
+
+
+def run_workload(base_url, students, concurrency, server=None, pool_size=None):
+    """
+    Sign up students (untimed), then time concurrent join/questions/submit.
+    With `server` and `pool_size`, first make sure the answering server is the one just
+    started with that pool size (a server already on the port would otherwise be measured).
+    """
+    shared = {}
+    if not EXAM_SETUP.run(ApiClient(base_url), shared):
+        raise RuntimeError("Exam setup failed")
+
+    def prepare(index):
+        ctx = {**shared, 'student': generate_account('student')}
+        client = ApiClient(base_url, verbose=False)
+        signup('student').run(client, ctx)
+        return client, ctx
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        users = list(pool.map(prepare, range(students)))
+
+    metrics = {'admin': generate_account('admin')}
+    admin = ApiClient(base_url, verbose=False)
+    signup('admin').run(admin, metrics)
+
+    recorder = Recorder()
+
+    def exam(user):
+        client, ctx = user
+        client.recorder = recorder
+        return JOIN_SUBMIT.run(client, ctx)
+
+    before = read_pool(admin, metrics)
+    if pool_size is not None and before['config']['maxPoolSize'] != pool_size:
+        raise RuntimeError(f"Server reports maxPoolSize {before['config']['maxPoolSize']}, expected {pool_size}; "
+                           f"is another server answering on {base_url}?")
+    if server:
+        server.check_running()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(exam, users))
+    elapsed = time.perf_counter() - start
+    after = read_pool(admin, metrics)
+
+    EXAM_TEARDOWN.run(ApiClient(base_url), dict(shared))
+
+    return {
+        **recorder.totals(elapsed),
+        'failed_students': outcomes.count(False),
+        **pool_delta(before, after),
+        'steps': recorder.summary(),
+    }
+
+
+def failed(result):
+    return result['errors'] > 0 or result['failed_students'] > 0
+
+
+def find_knee(results, tolerance=0.05):
+    """Smallest pool size whose throughput is within `tolerance` of the best clean run (no errors)"""
+    clean = [result for result in results if not failed(result)]
+    if not clean:
+        return None
+    best = max(result['throughput'] for result in clean)
+    for result in sorted(clean, key=lambda r: r['pool_size']):
+        if result['throughput'] >= best * (1 - tolerance):
+            return result['pool_size']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep MongoDB pool sizes against a join/submit workload")
+    parser.add_argument('--pool-sizes', default='2,5,10,20,50,100',
+                        help="Comma-separated MONGO_MAX_POOL_SIZE values")
+    parser.add_argument('--students', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--base-url', default=LOCAL_BASE_URL)
+    parser.add_argument('--server-cmd', default='yarn start', help="Command that starts the built server")
+    parser.add_argument('--server-cwd', default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument('--startup-timeout', type=int, default=120)
+    parser.add_argument('--knee-tolerance', type=float, default=0.05)
+    parser.add_argument('--output', help="Write sweep results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for size in [int(value) for value in args.pool_sizes.split(',')]:
+        print(f"🏊 Pool size {size}: starting server")
+        env = {'MONGO_MAX_POOL_SIZE': str(size)}
+        with ServerProcess(args.server_cmd, args.server_cwd, env, args.base_url, args.startup_timeout) as server:
+            result = {'pool_size': size,
+                      **run_workload(args.base_url, args.students, args.concurrency, server, size)}
+        results.append(result)
+        print(f"   {result['throughput']:.1f} req/s, p99 {format_value(result['p99_ms'], 'ms')}, "
+              f"checkout wait p99 {format_value(result['checkout_wait_ms'].get('p99'), 'ms')}, "
+              f"{result['errors']} errors, {result['failed_students']} failed students")
+
+    print("\n" + "=" * 60)
+    print("📋 POOL SWEEP SUMMARY")
+    print("=" * 60)
+    print(f"{'pool':>5} {'req/s':>8} {'p50':>9} {'p99':>9} {'wait p50':>9} {'wait p99':>9} {'timeouts':>9} "
+          f"{'errors':>7} {'failed':>7}")
+    for result in results:
+        wait = result['checkout_wait_ms']
+        print(f"{result['pool_size']:>5} {result['throughput']:>8.1f} "
+              f"{format_value(result['p50_ms'], 'ms'):>9} {format_value(result['p99_ms'], 'ms'):>9} "
+              f"{format_value(wait.get('p50'), 'ms'):>9} {format_value(wait.get('p99'), 'ms'):>9} "
+              f"{result['checkouts'].get('timedOut', 0):>9} {result['errors']:>7} {result['failed_students']:>7}")
+
+    failures = [result['pool_size'] for result in results if failed(result)]
+    if failures:
+        print(f"\n❌ Requests or students failed at pool size(s) {', '.join(map(str, failures))}; "
+              f"excluded from the knee")
+
+    knee = find_knee(results, args.knee_tolerance)
+    if knee is None:
+        print("\n❌ No pool size ran without failures; no knee")
+    else:
+        print(f"\n🎯 Knee: pool size {knee} "
+              f"(throughput within {args.knee_tolerance * 100:.0f}% of the best clean run)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results, 'knee': knee}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    return not failures
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Routing & Auth Micro-Benchmark for Test Platform
+Calls every route in the API dispatch table against a local server started with
+SERVER_TIMING=1 and reports client latency next to the server's own route-match,
+auth and total times from the Server-Timing header.
+Mutating routes are called as a role the route rejects, so repeated calls only
+exercise routing and the auth check and leave the data unchanged.
+"""
+
+import argparse
+import time
+
+from bench_results import build_run, save_run, trial_result
+from load_runner import Recorder, format_value, percentile
+from scenarios import (ApiClient, EXAM_SETUP, EXAM_TEARDOWN, JOIN_ROOM, LOCAL_BASE_URL, Step, generate_account,
+                       login, signup)
+
+# (method, path, caller, body, expected status); caller None is an anonymous session
+ROUTE_CALLS = [
+    ('POST', '/auth/signup', None, {}, 400),
+    ('POST', '/auth/login', None, {}, 400),
+    ('POST', '/auth/logout', None, None, 200),
+    ('GET', '/auth/me', 'student', None, 200),
+    ('GET', '/tests', 'teacher', None, 200),
+    ('POST', '/tests', 'student', {}, 401),
+    ('GET', '/tests/{test_id}', 'teacher', None, 200),
+    ('DELETE', '/tests/{test_id}', 'student', None, 401),
+    ('GET', '/rooms', 'teacher', None, 200),
+    ('POST', '/rooms', 'student', {}, 401),
+    ('GET', '/rooms/{room_id}', None, None, 200),
+    ('POST', '/rooms/{room_id}/join', 'student', None, 200),
+    ('GET', '/rooms/{room_id}/questions', 'student', None, 200),
+    ('POST', '/rooms/{room_id}/submit', 'teacher', {'answers': []}, 401),
+    ('POST', '/rooms/{room_id}/close', 'student', None, 401),
+    ('GET', '/rooms/{room_id}/results', 'teacher', None, 200),
+    ('GET', '/teachers', 'admin', None, 200),
+    ('POST', '/teachers', 'teacher', {}, 401),
+    ('DELETE', '/teachers/{teacher_id}', 'teacher', None, 401),
+    ('GET', '/metrics/pool', 'admin', None, 200),
+    # Unmatched path: routing only, no auth or handler
+    ('GET', '/no/such/route', None, None, 404),
+]
+
+
+def parse_server_timing(header):
+    """'route;dur=0.012, auth;dur=1.3' -> {'route': 0.012, 'auth': 1.3}"""
+    timings = {}
+    for entry in (header or '').split(','):
+        name, _, params = entry.strip().partition(';')
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip() == 'dur':
+                timings[name] = float(value)
+    return timings
+
+
+def prepare(base_url):
+    """Accounts for every role plus a test, a room the student joined and a teacher id"""
+    shared = {}
+    if not EXAM_SETUP.run(ApiClient(base_url), shared):
+        raise RuntimeError("Exam setup failed")
+
+    clients = {'teacher': ApiClient(base_url), None: ApiClient(base_url)}
+    login('teacher').run(clients['teacher'], shared)
+
+    for role in ('admin', 'student'):
+        shared[role] = generate_account(role)
+        clients[role] = ApiClient(base_url)
+        signup(role).run(clients[role], shared)
+
+    JOIN_ROOM.run(clients['student'], shared)
+    Step("List Teachers", 'GET', '/teachers',
+         save=lambda r, ctx: ctx.update(teacher_id=r.json()['teachers'][0]['_id'])).run(clients['admin'], shared)
+    return shared, clients
+
+
+def run_trial(clients, shared, iterations, warmup):
+    recorder = Recorder()
+    server = {}
+
+    for method, path, caller, body, expect in ROUTE_CALLS:
+        client = clients[caller]
+        label = f"{method} {path}"
+        endpoint = path.format(**shared)
+        step_server = server.setdefault(label, {'route': [], 'auth': [], 'total': []})
+
+        for i in range(warmup + iterations):
+            client.recorder = recorder if i >= warmup else None
+            response, success = client.make_request(method, endpoint, body, expect, label=label)
+            if i >= warmup and response is not None:
+                for name, value in parse_server_timing(response.headers.get('Server-Timing')).items():
+                    step_server.setdefault(name, []).append(value)
+
+    return recorder, server
+
+
+def print_report(recorder, server):
+    print(f"\n{'Route':<36} {'client p50':>10} {'p99':>8} {'route p50':>10} {'auth p50':>9} "
+          f"{'total p50':>10} {'overhead':>9}")
+    summary = recorder.summary()
+    for method, path, *_ in ROUTE_CALLS:
+        label = f"{method} {path}"
+        stats = summary.get(label)
+        timings = server.get(label, {})
+        route = percentile(timings.get('route', []), 50)
+        auth = percentile(timings.get('auth', []), 50)
+        total = percentile(timings.get('total', []), 50)
+        overhead = ((route or 0) + (auth or 0)) / total * 100 if total else None
+        print(f"{label:<36} {format_value(stats and stats['p50_ms'], 'ms'):>10} "
+              f"{format_value(stats and stats['p99_ms'], 'ms'):>8} {format_value(route, 'ms', 3):>10} "
+              f"{format_value(auth, 'ms', 2):>9} {format_value(total, 'ms', 2):>10} "
+              f"{format_value(overhead, '%'):>9}")
+
+    if not any(timings.get('route') for timings in server.values()):
+        print("\n⚠️  No Server-Timing headers received; start the server with SERVER_TIMING=1")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-request routing and auth overhead on every route")
+    parser.add_argument('--base-url', default=LOCAL_BASE_URL)
+    parser.add_argument('--iterations', type=int, default=200, help="Measured calls per route")
+    parser.add_argument('--warmup', type=int, default=20, help="Unmeasured calls per route")
+    parser.add_argument('--trials', type=int, default=1)
+    parser.add_argument('--output', help="Write a benchmark result JSON (see bench_results.py)")
+    args = parser.parse_args()
+
+    print("🧭 Routing & Auth Micro-Benchmark")
+    print("=" * 60)
+    shared, clients = prepare(args.base_url)
+
+    trials = []
+    try:
+        for trial in range(args.trials):
+            start = time.perf_counter()
+            recorder, server = run_trial(clients, shared, args.iterations, args.warmup)
+            elapsed = time.perf_counter() - start
+            print_report(recorder, server)
+            trials.append({
+                **trial_result(recorder, elapsed),
+                'server_timing_ms': {
+                    label: {name: percentile(values, 50) for name, values in timings.items()}
+                    for label, timings in server.items()
+                },
+            })
+    finally:
+        EXAM_TEARDOWN.run(ApiClient(args.base_url), dict(shared))
+
+    if args.output:
+        config = {'iterations': args.iterations, 'warmup': args.warmup}
+        save_run(build_run("routing", trials, config, args.base_url), args.output)
+        print(f"\nBenchmark result written to {args.output}")
+
+    return all(trial['errors'] == 0 for trial in trials)
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
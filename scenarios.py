@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Declarative API Scenarios for Test Platform
+A scenario is an ordered list of steps plus a load-mix weight and a per-user data generator.
+The same definition runs once as a functional test (backend_test.py) or as a weighted
+mix of virtual users under the load engine (load_runner.py).
+"""
+
+import os
+import random
+import string
+import time
+
+import requests
+
+# Base URL from environment
+BASE_URL = os.environ.get("TEST_PLATFORM_BASE_URL", "https://learncheck-5.preview.emergentagent.com/api")
+
+# Server started locally, used by the benchmarks that restart or instrument it
+LOCAL_BASE_URL = "http://localhost:3000/api"
+
+# Seconds before a request is abandoned and counted as failed
+REQUEST_TIMEOUT = 30
+
+
+def generate_random_string(length=8):
+    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+
+
+def generate_test_email(prefix="test"):
+    return f"{prefix}_{generate_random_string()}@testplatform.com"
+
+
+def generate_account(role, password=None):
+    """Fresh signup payload for the given role ("admin", "teacher" or "student")"""
+    return {
+        "name": f"Test {role.title()}",
+        "email": generate_test_email(role),
+        "password": password or f"{role}123",
+        "role": role.upper()
+    }
+
+
+class ApiClient:
+    """One user's HTTP session; reports every request latency to an optional recorder"""
+
+    def __init__(self, base_url=BASE_URL, recorder=None, verbose=True, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.recorder = recorder
+        self.verbose = verbose
+        self.timeout = timeout
+
+    def make_request(self, method, endpoint, data=None, expected_status=200, label=None):
+        url = f"{self.base_url}{endpoint}"
+        label = label or f"{method.upper()} {endpoint}"
+        start = time.perf_counter()
+        try:
+            if method.upper() == 'GET':
+                response = self.session.get(url, timeout=self.timeout)
+            elif method.upper() == 'POST':
+                response = self.session.post(url, json=data, timeout=self.timeout)
+            elif method.upper() == 'DELETE':
+                response = self.session.delete(url, timeout=self.timeout)
+            else:
+                raise ValueError(f"Unsupported method: {method}")
+        except Exception as e:
+            if self.recorder:
+                self.recorder.record(label, time.perf_counter() - start, False)
+            if self.verbose:
+                print(f"❌ Request error: {method} {endpoint} - {str(e)}")
+            return None, False
+
+        success = response.status_code == expected_status
+        if self.recorder:
+            self.recorder.record(label, time.perf_counter() - start, success)
+
+        if not success and self.verbose:
+            print(f"❌ Request failed: {method} {endpoint}")
+            print(f"   Expected status: {expected_status}, Got: {response.status_code}")
+            print(f"   Response: {response.text}")
+
+        return response, success
+
+
+class Step:
+    """
+    One API call within a scenario.
+    `path` is a format string filled from the scenario context, `body` is a dict or a
+    callable(ctx), `save(response, ctx)` stores values for later steps and
+    `check(response, ctx)` returns (passed, details).
+    """
+
+    def __init__(self, name, method, path, body=None, expect=200, check=None, save=None, think=0):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.expect = expect
+        self.check = check
+        self.save = save
+        self.think = think
+
+    def run(self, client, ctx):
+        if self.think:
+            time.sleep(self.think)
+
+        try:
+            endpoint = self.path.format(**ctx)
+            data = self.body(ctx) if callable(self.body) else self.body
+        except KeyError as e:
+            return False, f"Missing scenario value: {e}"
+
+        response, success = client.make_request(self.method, endpoint, data, self.expect,
+                                                label=f"{self.method} {self.path}")
+        if not success:
+            return False, f"Expected status {self.expect}"
+
+        try:
+            if self.save:
+                self.save(response, ctx)
+            if self.check:
+                return self.check(response, ctx)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return False, f"Unexpected response: {str(e)}"
+
+        return True, ""
+
+
+class Scenario:
+    """Named list of steps, its weight in a load mix and a per-user data generator"""
+
+    def __init__(self, name, steps, weight=1, data=None, critical=False):
+        self.name = name
+        self.steps = steps
+        self.weight = weight
+        self.data = data
+        self.critical = critical
+
+    def run(self, client, ctx, log=None):
+        """Run steps in order against ctx, stopping at the first failure"""
+        if self.data:
+            ctx.update(self.data(ctx))
+
+        for step in self.steps:
+            success, details = step.run(client, ctx)
+            if log:
+                log(step.name, success, details)
+            if not success:
+                return False
+
+        return True
+
+
+# ============================================
+# STEP HELPERS
+# ============================================
+
+def signup(role):
+    """Sign up the account generated under ctx[role]"""
+    return Step(f"{role.title()} Signup", 'POST', '/auth/signup',
+                body=lambda ctx: ctx[role],
+                check=lambda r, ctx: (True, f"{role.title()} created: {ctx[role]['email']}"))
+
+
+def login(role):
+    """Log in with the account stored under ctx[role]"""
+    return Step(f"{role.title()} Login", 'POST', '/auth/login',
+                body=lambda ctx: {"email": ctx[role]['email'], "password": ctx[role]['password']})
+
+
+def save_json(key, *path):
+    """Save a nested value of the JSON response into ctx[key]"""
+    def save(response, ctx):
+        value = response.json()
+        for part in path:
+            value = value[part]
+        ctx[key] = value
+    return save
+
+
+def build_answers(questions, randomize=False):
+    """Answer payload covering every question; picks first options unless randomized"""
+    answers = []
+    for question in questions:
+        if question['type'] == 'MULTIPLE_CHOICE':
+            options = question.get('options', [])
+            if options:
+                option = random.choice(options) if randomize else options[0]
+                answers.append({'questionId': question['_id'], 'answer': option['_id']})
+        elif question['type'] == 'MATCHING':
+            lefts = question.get('lefts', [])
+            rights = list(question.get('rights', []))
+            if randomize:
+                random.shuffle(rights)
+            if lefts and rights:
+                pairs = [{'leftId': left['id'], 'rightId': right['id']} for left, right in zip(lefts, rights)]
+                answers.append({'questionId': question['_id'], 'answer': pairs})
+        elif question['type'] == 'OPEN':
+            answers.append({'questionId': question['_id'], 'answer': 'This is a sample answer for the open question.'})
+    return answers
+
+
+def check_rejoin(response, ctx):
+    room_student = response.json().get('roomStudent')
+    same_variant = room_student.get('assignedVariantId') == ctx['assigned_variant']
+    already_joined = response.json().get('alreadyJoined', False)
+    return same_variant and already_joined, f"Same variant maintained: {same_variant}, Already joined flag: {already_joined}"
+
+
+def check_question_types(response, ctx):
+    question_types = {q.get('type') for q in ctx['questions']}
+    return {'MULTIPLE_CHOICE', 'MATCHING', 'OPEN'} <= question_types, f"Types found: {question_types}"
+
+
+def check_test_details(response, ctx):
+    variants = response.json().get('test').get('variants', [])
+    total_questions = sum(len(v.get('questions', [])) for v in variants)
+    return True, f"Test has {len(variants)} variants, total questions: {total_questions}"
+
+
+def check_teacher_results(response, ctx):
+    results = response.json().get('results', [])
+    if not results:
+        return True, "Found 0 results"
+    result = results[0]
+    score = result.get('score')
+    total_points = result.get('totalPoints')
+    return (score is not None and total_points is not None,
+            f"Found {len(results)} results, Score: {score}/{total_points} ({result.get('percentage')}%)")
+
+
+def check_student_result(response, ctx):
+    result = response.json().get('result')
+    if not result:
+        return False, "No result found for student"
+    return True, f"Student score: {result.get('score')}/{result.get('totalPoints')}"
+
+
+# ============================================
+# SAMPLE DATA
+# ============================================
+
+SAMPLE_TEST = {
+    "title": "Sample Test with Multiple Variants",
+    "description": "Test with MULTIPLE_CHOICE, MATCHING, and OPEN questions",
+    "variants": [
+        {
+            "name": "Variant A",
+            "questions": [
+                {
+                    "text": "What is 2 + 2?",
+                    "type": "MULTIPLE_CHOICE",
+                    "points": 2,
+                    "options": [
+                        {"text": "3", "isCorrect": False},
+                        {"text": "4", "isCorrect": True},
+                        {"text": "5", "isCorrect": False}
+                    ]
+                },
+                {
+                    "text": "Match the following:",
+                    "type": "MATCHING",
+                    "points": 3,
+                    "pairs": [
+                        {"left": "Apple", "right": "Fruit"},
+                        {"left": "Car", "right": "Vehicle"},
+                        {"left": "Dog", "right": "Animal"}
+                    ]
+                },
+                {
+                    "text": "Explain the concept of gravity.",
+                    "type": "OPEN",
+                    "points": 5
+                }
+            ]
+        },
+        {
+            "name": "Variant B",
+            "questions": [
+                {
+                    "text": "What is 3 + 3?",
+                    "type": "MULTIPLE_CHOICE",
+                    "points": 2,
+                    "options": [
+                        {"text": "5", "isCorrect": False},
+                        {"text": "6", "isCorrect": True},
+                        {"text": "7", "isCorrect": False}
+                    ]
+                },
+                {
+                    "text": "Match the following:",
+                    "type": "MATCHING",
+                    "points": 3,
+                    "pairs": [
+                        {"left": "Book", "right": "Reading"},
+                        {"left": "Pen", "right": "Writing"},
+                        {"left": "Phone", "right": "Communication"}
+                    ]
+                },
+                {
+                    "text": "Describe the water cycle.",
+                    "type": "OPEN",
+                    "points": 5
+                }
+            ]
+        }
+    ]
+}
+
+
+# ============================================
+# STUDENT EXAM STEPS
+# ============================================
+
+# Shared by the functional suite, the load mix and the benchmarks. Answers are
+# randomized when the scenario's data generator sets ctx['randomize_answers'].
+JOIN_ROOM = Step("Student Join Room", 'POST', '/rooms/{room_id}/join',
+                 save=save_json('assigned_variant', 'roomStudent', 'assignedVariantId'),
+                 check=lambda r, ctx: (True, f"Assigned variant: {ctx['assigned_variant']}"))
+
+GET_QUESTIONS = Step("Get Room Questions", 'GET', '/rooms/{room_id}/questions',
+                     save=save_json('questions', 'questions'), check=check_question_types)
+
+SUBMIT_ANSWERS = Step("Student Submit Answers", 'POST', '/rooms/{room_id}/submit',
+                      body=lambda ctx: {'answers': build_answers(ctx['questions'],
+                                                                 randomize=ctx.get('randomize_answers', False))})
+
+JOIN_SUBMIT = Scenario("Join & Submit", [JOIN_ROOM, GET_QUESTIONS, SUBMIT_ANSWERS],
+                       data=lambda ctx: {'randomize_answers': True})
+
+
+# ============================================
+# FUNCTIONAL SUITE
+# ============================================
+
+AUTH_SIGNUP = Scenario("Auth Signup", [
+    signup('admin'),
+    signup('teacher'),
+    signup('student'),
+], data=lambda ctx: {role: generate_account(role) for role in ('admin', 'teacher', 'student')})
+
+AUTH_LOGIN = Scenario("Auth Login", [
+    login('admin'),
+    login('teacher'),
+    login('student'),
+])
+
+AUTH_ME = Scenario("Auth Me", [
+    Step("Get Current User", 'GET', '/auth/me',
+         check=lambda r, ctx: ('user' in r.json(), f"User: {r.json().get('user', {}).get('name', 'Unknown')}")),
+])
+
+ADMIN_FLOW = Scenario("Admin Flow", [
+    login('admin'),
+    Step("Admin Create Teacher", 'POST', '/teachers',
+         body=lambda ctx: ctx['admin_created_teacher'],
+         save=save_json('admin_created_teacher_id', 'teacherId')),
+    Step("Admin List Teachers", 'GET', '/teachers',
+         check=lambda r, ctx: (True, f"Found {len(r.json().get('teachers', []))} teachers")),
+    Step("Admin Delete Teacher", 'DELETE', '/teachers/{admin_created_teacher_id}'),
+], data=lambda ctx: {'admin_created_teacher': {
+    "name": "Admin Created Teacher",
+    "email": generate_test_email("admin_teacher"),
+    "password": "teacher456"
+}})
+
+TEACHER_TEST_MANAGEMENT = Scenario("Teacher Test Management", [
+    login('teacher'),
+    Step("Teacher Create Test", 'POST', '/tests', body=SAMPLE_TEST, save=save_json('test_id', 'testId')),
+    Step("Teacher List Tests", 'GET', '/tests',
+         check=lambda r, ctx: (True, f"Found {len(r.json().get('tests', []))} tests")),
+    Step("Teacher Get Test Details", 'GET', '/tests/{test_id}', check=check_test_details),
+])
+
+ROOM_MANAGEMENT = Scenario("Room Management", [
+    login('teacher'),
+    Step("Teacher Create Room", 'POST', '/rooms',
+         body=lambda ctx: {"testId": ctx['test_id'], "name": "Test Room for Sample Test"},
+         save=save_json('room_id', 'roomId')),
+    Step("Teacher List Rooms", 'GET', '/rooms',
+         check=lambda r, ctx: (True, f"Found {len(r.json().get('rooms', []))} rooms")),
+    Step("Get Room Details", 'GET', '/rooms/{room_id}',
+         check=lambda r, ctx: (True, f"Room status: {r.json().get('room').get('status')}")),
+])
+
+STUDENT_ROOM_LOGIN = Scenario("Student Room Login", [
+    Step("Student Room Login (name only)", 'POST', '/auth/login',
+         body=lambda ctx: {"name": f"Room Student {generate_random_string()}", "roomId": ctx['room_id']},
+         check=lambda r, ctx: (r.json().get('user', {}).get('role') == 'STUDENT', "Logged in by name")),
+])
+
+STUDENT_ROOM_FLOW = Scenario("Student Room Flow", [
+    login('student'),
+    JOIN_ROOM,
+    Step("Student Rejoin Room", 'POST', '/rooms/{room_id}/join', check=check_rejoin),
+    GET_QUESTIONS,
+    SUBMIT_ANSWERS,
+    Step("Student Update Answers", 'POST', '/rooms/{room_id}/submit', body=SUBMIT_ANSWERS.body, think=1),
+], critical=True)
+
+ROOM_CLOSING = Scenario("Room Closing & Auto-Checking", [
+    login('teacher'),
+    Step("Teacher Close Room", 'POST', '/rooms/{room_id}/close'),
+    Step("Room Status Verification", 'GET', '/rooms/{room_id}',
+         check=lambda r, ctx: (r.json().get('room').get('status') == 'CLOSED',
+                               f"Room status is {r.json().get('room').get('status')}")),
+    login('student'),
+    Step("Prevent Submit After Close", 'POST', '/rooms/{room_id}/submit', body={'answers': []}, expect=400),
+], critical=True)
+
+RESULTS_VIEWING = Scenario("Results Viewing", [
+    login('teacher'),
+    Step("Teacher View All Results", 'GET', '/rooms/{room_id}/results', check=check_teacher_results),
+    login('student'),
+    Step("Student View Own Result", 'GET', '/rooms/{room_id}/results', check=check_student_result),
+])
+
+AUTHORIZATION = Scenario("Authorization Controls", [
+    login('student'),
+    Step("Student Cannot Create Test", 'POST', '/tests',
+         body={"title": "Unauthorized Test", "variants": []}, expect=401),
+    Step("Student Cannot Access Teachers", 'GET', '/teachers', expect=401),
+])
+
+AUTH_LOGOUT = Scenario("Auth Logout", [
+    Step("Logout", 'POST', '/auth/logout'),
+])
+
+CLEANUP = Scenario("Cleanup", [
+    login('teacher'),
+    Step("Cleanup - Delete Test", 'DELETE', '/tests/{test_id}'),
+])
+
+FUNCTIONAL_SUITE = [
+    AUTH_SIGNUP,
+    AUTH_LOGIN,
+    AUTH_ME,
+    ADMIN_FLOW,
+    TEACHER_TEST_MANAGEMENT,
+    ROOM_MANAGEMENT,
+    STUDENT_ROOM_LOGIN,
+    STUDENT_ROOM_FLOW,
+    ROOM_CLOSING,
+    RESULTS_VIEWING,
+    AUTHORIZATION,
+    AUTH_LOGOUT,
+    CLEANUP,
+]
+
+
+# ============================================
+# LOAD MIX
+# ============================================
+
+CREATE_EXAM = [
+    Step("Teacher Create Test", 'POST', '/tests', body=SAMPLE_TEST, save=save_json('test_id', 'testId')),
+    Step("Teacher Create Room", 'POST', '/rooms',
+         body=lambda ctx: {"testId": ctx['test_id'], "name": "Load Test Room"},
+         save=save_json('room_id', 'roomId')),
+]
+
+# Run once before the mix; its context (teacher account, test, room) is shared read-only by every virtual user
+EXAM_SETUP = Scenario("Exam Setup", [signup('teacher')] + CREATE_EXAM,
+                      data=lambda ctx: {'teacher': generate_account('teacher')})
+
+STUDENT_EXAM = Scenario("Student Exam", [signup('student')] + JOIN_SUBMIT.steps, weight=8,
+                        data=lambda ctx: {'student': generate_account('student'), 'randomize_answers': True})
+
+TEACHER_MONITOR = Scenario("Teacher Monitor", [
+    login('teacher'),
+    Step("Teacher List Rooms", 'GET', '/rooms'),
+    Step("Get Room Details", 'GET', '/rooms/{room_id}'),
+    Step("Teacher Get Test Details", 'GET', '/tests/{test_id}'),
+], weight=1)
+
+# Run once after the mix: grades every student who submitted, then removes the test
+EXAM_TEARDOWN = Scenario("Exam Teardown", [
+    login('teacher'),
+    Step("Teacher Close Room", 'POST', '/rooms/{room_id}/close'),
+    Step("Teacher View All Results", 'GET', '/rooms/{room_id}/results', check=check_teacher_results),
+    Step("Cleanup - Delete Test", 'DELETE', '/tests/{test_id}'),
+])
+
+LOAD_MIX = [STUDENT_EXAM, TEACHER_MONITOR]
+
+# Returning-user variants for long runs: the teacher and students are existing accounts
+# (ctx['teacher'], ctx['student']) that log in, so the users collection stays the same size
+RETURNING_EXAM_SETUP = Scenario("Exam Setup", [login('teacher')] + CREATE_EXAM)
+
+RETURNING_STUDENT_EXAM = Scenario("Student Exam", [login('student')] + JOIN_SUBMIT.steps, weight=8,
+                                  data=lambda ctx: {'randomize_answers': True})
+
+RETURNING_MIX = [RETURNING_STUDENT_EXAM, TEACHER_MONITOR]
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Soak Testing for Test Platform
+Runs back-to-back exam cycles (setup, weighted scenario mix, close/grade/delete) for hours.
+A fixed pool of teacher and student accounts is signed up once and logs in every cycle,
+so the harness itself doesn't grow the data set it is measuring.
+Every time window it samples latency percentiles, server RSS and MongoDB connection count,
+then flags drift such as p99 creep, memory growth or leaking connections.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from load_runner import LoadRunner, Recorder, format_value
+from scenarios import (ApiClient, BASE_URL, EXAM_TEARDOWN, REQUEST_TIMEOUT, RETURNING_EXAM_SETUP, RETURNING_MIX,
+                       generate_account, signup)
+
+try:
+    from pymongo import MongoClient
+except ImportError:
+    MongoClient = None
+
+
+def process_tree(pid):
+    """The pid plus all its descendants (Next.js may fork worker processes)"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # Field 4 is the parent pid; the command name before it may contain spaces
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    tree = [pid]
+    for current in tree:
+        tree.extend(children.get(current, []))
+    return tree
+
+
+def read_rss_mb(pid):
+    """Resident set size of a server process tree in MB, or None if unavailable"""
+    total_kb = 0
+    found = False
+    for member in process_tree(pid):
+        try:
+            with open(f'/proc/{member}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        found = True
+        except OSError:
+            continue
+    return total_kb / 1024 if found else None
+
+
+def linear_slope(xs, ys):
+    """Least-squares slope of ys over xs, or None with fewer than two points"""
+    points = [(x, y) for x, y in zip(xs, ys) if y is not None]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+class SoakRunner:
+    """Drives exam cycles until `hours` have passed, summarising each `window` seconds"""
+
+    def __init__(self, hours=8, window=300, users=200, concurrency=20, base_url=BASE_URL,
+                 server_pid=None, mongo_url=None, request_timeout=REQUEST_TIMEOUT):
+        self.hours = hours
+        self.window = window
+        self.users = users
+        self.concurrency = concurrency
+        self.base_url = base_url
+        self.server_pid = server_pid
+        self.request_timeout = request_timeout
+        self.mongo = None
+        self.windows = []
+        self.teacher = None
+        self.students = []
+
+        if mongo_url:
+            if MongoClient is None:
+                print("⚠️  pymongo is not installed; MongoDB connection count will not be sampled")
+            else:
+                self.mongo = MongoClient(mongo_url, serverSelectionTimeoutMS=5000)
+
+    def mongo_connections(self):
+        if not self.mongo:
+            return None
+        try:
+            return self.mongo.admin.command('serverStatus')['connections']['current']
+        except Exception as e:
+            print(f"⚠️  Could not read MongoDB serverStatus: {str(e)}")
+            return None
+
+    def client(self):
+        return ApiClient(self.base_url, verbose=False, timeout=self.request_timeout)
+
+    def create_accounts(self):
+        """Sign up the teacher and `users` students reused by every cycle"""
+        self.teacher = generate_account('teacher')
+        if not signup('teacher').run(self.client(), {'teacher': self.teacher})[0]:
+            raise RuntimeError("Could not sign up the soak teacher")
+
+        def student(index):
+            account = generate_account('student')
+            passed = signup('student').run(self.client(), {'student': account})[0]
+            return account if passed else None
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            self.students = [account for account in pool.map(student, range(self.users)) if account]
+        if not self.students:
+            raise RuntimeError("Could not sign up any soak students")
+        print(f"👥 Account pool: 1 teacher, {len(self.students)} students")
+
+    def run_window(self, deadline):
+        """Run exam cycles until the window closes and return its sample"""
+        recorder = Recorder()
+        cycles = 0
+        failed_users = 0
+        failed_teardowns = 0
+        start = time.perf_counter()
+        window_end = min(time.time() + self.window, deadline)
+
+        while time.time() < window_end:
+            runner = LoadRunner(scenarios=RETURNING_MIX, users=self.users, concurrency=self.concurrency,
+                                base_url=self.base_url, setup=RETURNING_EXAM_SETUP, teardown=EXAM_TEARDOWN,
+                                recorder=recorder, shared={'teacher': self.teacher},
+                                user_data=lambda index: {'student': self.students[index % len(self.students)]},
+                                request_timeout=self.request_timeout)
+            try:
+                runner.run()
+            except RuntimeError as e:
+                print(f"❌ Exam cycle aborted: {str(e)}")
+                failed_users += self.users
+                time.sleep(5)  # Don't spin against a server that is down
+            else:
+                failed_users += sum(o['failed'] for o in runner.outcomes.values())
+            if runner.teardown_passed is False:
+                # The cycle's test was not deleted, so its data stays in the database
+                failed_teardowns += 1
+            cycles += 1
+
+        elapsed = time.perf_counter() - start
+
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_hours': (time.time() - self.started_at) / 3600,
+            'cycles': cycles,
+            'users': cycles * self.users,
+            'failed_users': failed_users,
+            'failed_teardowns': failed_teardowns,
+            **recorder.totals(elapsed),
+            'rss_mb': read_rss_mb(self.server_pid) if self.server_pid else None,
+            'mongo_connections': self.mongo_connections(),
+            'steps': recorder.summary(),
+        }
+
+    def run(self):
+        self.started_at = time.time()
+        deadline = self.started_at + self.hours * 3600
+
+        self.create_accounts()
+        print(f"🕒 Soak test: {self.hours}h in {self.window}s windows, "
+              f"{self.users} users per exam (concurrency {self.concurrency})")
+        print(f"{'window':>6} {'hours':>6} {'req':>7} {'err':>5} {'rps':>7} "
+              f"{'p50':>8} {'p95':>8} {'p99':>8} {'rss':>9} {'conns':>6}")
+
+        while time.time() < deadline:
+            sample = self.run_window(deadline)
+            self.windows.append(sample)
+            print(f"{len(self.windows):>6} {sample['elapsed_hours']:>6.2f} {sample['requests']:>7} "
+                  f"{sample['errors']:>5} {sample['throughput']:>7.1f} "
+                  f"{format_value(sample['p50_ms'], 'ms', 0):>8} {format_value(sample['p95_ms'], 'ms', 0):>8} "
+                  f"{format_value(sample['p99_ms'], 'ms', 0):>8} {format_value(sample['rss_mb'], 'MB', 0):>9} "
+                  f"{format_value(sample['mongo_connections'], '', 0):>6}")
+
+        return self.windows
+
+
+def health_findings(windows, max_error_rate=0.01, max_failed_users=0.01):
+    """Absolute checks on every window, warm-up included: nothing completed, errors, failed users, teardowns"""
+    findings = []
+    for number, w in enumerate(windows, 1):
+        if not w['requests']:
+            findings.append(f"Window {number}: no requests completed (server down or setup failing)")
+            continue
+        error_rate = w['errors'] / w['requests']
+        if error_rate > max_error_rate:
+            findings.append(f"Window {number}: error rate {error_rate * 100:.1f}% "
+                            f"(limit {max_error_rate * 100:.1f}%)")
+        failed_rate = w['failed_users'] / w['users'] if w.get('users') else 0
+        if failed_rate > max_failed_users:
+            findings.append(f"Window {number}: {w['failed_users']}/{w['users']} users failed their scenario "
+                            f"(limit {max_failed_users * 100:.1f}%)")
+        if w.get('failed_teardowns'):
+            findings.append(f"Window {number}: {w['failed_teardowns']}/{w['cycles']} exam teardowns failed "
+                            f"(tests left in the database)")
+    return findings
+
+
+def detect_drift(windows, warmup=1, p99_creep=0.25, rss_growth=50, connection_growth=5,
+                 max_error_rate=0.01, max_failed_users=0.01):
+    """
+    Health checks on every window (see health_findings), then compare the start and end of
+    the run after skipping `warmup` windows.
+    Thresholds: relative p99 increase (last third vs first third), RSS growth in MB/hour
+    and MongoDB connection growth per hour. Returns a list of human-readable findings;
+    a run too short to judge drift is itself a finding.
+    """
+    findings = health_findings(windows, max_error_rate, max_failed_users)
+
+    steady = windows[warmup:]
+    if len(steady) < 3:
+        findings.append(f"Only {len(steady)} window(s) after {warmup} warm-up; need at least 3 to judge drift "
+                        f"(lengthen --hours or shorten --window)")
+        return findings
+
+    hours = [w['elapsed_hours'] for w in steady]
+    third = max(1, len(steady) // 3)
+
+    early = [w['p99_ms'] for w in steady[:third] if w['p99_ms'] is not None]
+    late = [w['p99_ms'] for w in steady[-third:] if w['p99_ms'] is not None]
+    if early and late:
+        early_p99 = sum(early) / len(early)
+        late_p99 = sum(late) / len(late)
+        if early_p99 > 0 and late_p99 / early_p99 - 1 > p99_creep:
+            findings.append(f"p99 creep: {early_p99:.0f}ms → {late_p99:.0f}ms "
+                            f"(+{(late_p99 / early_p99 - 1) * 100:.0f}%)")
+
+    rss_slope = linear_slope(hours, [w['rss_mb'] for w in steady])
+    if rss_slope is not None and rss_slope > rss_growth:
+        findings.append(f"Server memory growth: {rss_slope:.1f} MB/hour")
+
+    connection_slope = linear_slope(hours, [w['mongo_connections'] for w in steady])
+    if connection_slope is not None and connection_slope > connection_growth:
+        findings.append(f"MongoDB connection growth: {connection_slope:.1f} connections/hour")
+
+    error_rates = [w['errors'] / w['requests'] if w['requests'] else 0 for w in steady]
+    if error_rates[-1] > 2 * error_rates[0] and error_rates[-1] > max_error_rate / 2:
+        findings.append(f"Error rate rose from {error_rates[0] * 100:.1f}% to {error_rates[-1] * 100:.1f}%")
+
+    return findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the exam workload for hours and flag resource drift")
+    parser.add_argument('--hours', type=float, default=8)
+    parser.add_argument('--window', type=int, default=300, help="Seconds per sampling window")
+    parser.add_argument('--users', type=int, default=200, help="Virtual users per exam cycle")
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--server-pid', type=int, help="PID of the Next.js server, for RSS sampling")
+    parser.add_argument('--mongo-url', default=os.environ.get('MONGO_URL'),
+                        help="MongoDB URI for connection counts (requires pymongo)")
+    parser.add_argument('--request-timeout', type=float, default=REQUEST_TIMEOUT,
+                        help="Seconds before a request is abandoned and counted as failed")
+    parser.add_argument('--warmup-windows', type=int, default=1)
+    parser.add_argument('--p99-creep', type=float, default=0.25, help="Allowed relative p99 increase")
+    parser.add_argument('--rss-growth', type=float, default=50, help="Allowed RSS growth in MB/hour")
+    parser.add_argument('--connection-growth', type=float, default=5,
+                        help="Allowed MongoDB connection growth per hour")
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help="Allowed fraction of failed requests in any window")
+    parser.add_argument('--max-failed-users', type=float, default=0.01,
+                        help="Allowed fraction of virtual users failing their scenario in any window")
+    parser.add_argument('--output', help="Write the window timeline and findings as JSON")
+    args = parser.parse_args()
+
+    soak = SoakRunner(hours=args.hours, window=args.window, users=args.users, concurrency=args.concurrency,
+                      base_url=args.base_url, server_pid=args.server_pid, mongo_url=args.mongo_url,
+                      request_timeout=args.request_timeout)
+    windows = soak.run()
+    findings = detect_drift(windows, warmup=args.warmup_windows, p99_creep=args.p99_creep,
+                            rss_growth=args.rss_growth, connection_growth=args.connection_growth,
+                            max_error_rate=args.max_error_rate, max_failed_users=args.max_failed_users)
+
+    print("\n" + "=" * 60)
+    print("📋 SOAK SUMMARY")
+    print("=" * 60)
+    if findings:
+        print("⚠️  SOAK FAILED:")
+        for finding in findings:
+            print(f"   - {finding}")
+    else:
+        print("🎉 No drift or failures detected.")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'windows': windows, 'findings': findings}, f, indent=2)
+        print(f"\nTimeline written to {args.output}")
+
+    return not findings
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)